@@ -1,29 +1,171 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp
+import asyncio
+import functools
+import gzip
+import io
+import queue
+import threading
 import time
 from pathlib import Path
 import logging
 from urllib.parse import urlparse, urljoin
+from urllib.robotparser import RobotFileParser
 import re
 from collections import deque
 import sys
 import os
+import shutil
+import tempfile
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Pages with less static text than this are assumed to be JS-rendered
+JS_RENDER_THRESHOLD = 500
+
+# Statuses meaning the page does not exist; anything else that is not a 200
+# (bot challenges, rate limiting, server errors) is retried in the browser
+MISSING_STATUSES = (404, 410)
+
+# Pages with less text than this are not worth converting to markdown
+MIN_PAGE_CHARS = 200
+
+# Containers that usually hold a page's main content, in order of preference;
+# the first one holding more than MAIN_CONTENT_CHARS of text is used
+MAIN_CONTENT_CHARS = 200
+CONTENT_SELECTORS = (
+    "main", "article", "#content", ".content", ".main-content",
+    ".page-content", ".entry-content", ".post-content",
+    "section", ".section", "[role='main']", ".container",
+    "#main", ".main", ".body-content"
+)
+
+# Resources the browser never needs to load for text extraction
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3",
+    "*googletagmanager*", "*google-analytics*", "*doubleclick*"
+]
+
+# Readiness probes used instead of fixed sleeps while a page renders
+CONTENT_READY_JS = ("return document.readyState !== 'loading' && "
+                    "document.querySelectorAll('h1, h2, p, li, article, main').length > 0")
+TEXT_LENGTH_JS = "return document.body ? document.body.innerText.length : 0"
+
+# Marks elements hidden by computed style, then returns the final URL and
+# rendered HTML of the page, all in one CDP round-trip
+HIDDEN_ATTRIBUTE = 'data-scraper-hidden'
+RENDER_SNAPSHOT_JS = """(() => {
+    document.querySelectorAll('body *').forEach(el => {
+        const style = getComputedStyle(el);
+        if (style.display === 'none' || style.visibility === 'hidden') {
+            el.setAttribute('%s', '');
+        }
+    });
+    return {url: location.href, html: document.documentElement.outerHTML};
+})()""" % HIDDEN_ATTRIBUTE
+
+HIDDEN_CANDIDATES = etree.XPath(f"//*[@hidden or @style or @{HIDDEN_ATTRIBUTE}]")
+TEXT_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "span", "div")
+
+# Links to files and social networks are never crawled
+FILE_EXTENSIONS = ('.pdf', '.jpg', '.png', '.gif', '.jpeg', '.doc', '.docx')
+SOCIAL_DOMAINS = ('facebook.com', 'twitter.com', 'linkedin.com', 'instagram.com')
+
+WHITESPACE_RE = re.compile(r'\s+')
+MARKDOWN_ESCAPE_RE = re.compile(r'([*_`#\[\]])')
+FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_selector(selectors):
+    """Compile a union of CSS selectors once per process."""
+    return CSSSelector(", ".join(selectors))
+
+
+@functools.lru_cache(maxsize=None)
+def _html_parser(encoding):
+    """Shared C parser per charset; pages are only parsed on the event loop thread."""
+    return lxml_html.HTMLParser(encoding=encoding, remove_comments=True)
+
+
+@functools.lru_cache(maxsize=200_000)
+def _valid_url(url, domain, language):
+    """Check if URL should be crawled, memoized across pages."""
+    parsed = urlparse(url)
+    
+    # Must be same domain
+    if parsed.netloc != domain:
+        return False
+        
+    # Ignore anchors
+    if '#' in url:
+        return False
+    
+    url_lower = url.lower()
+        
+    # Ignore file downloads
+    if url_lower.endswith(FILE_EXTENSIONS):
+        return False
+        
+    # Ignore social media and external links
+    if any(pattern in url_lower for pattern in SOCIAL_DOMAINS):
+        return False
+        
+    # Check language if specified
+    if language:
+        url_path = parsed.path.lower()
+        if not url_path.startswith(f'/{language.lower()}/') and not url_path == f'/{language.lower()}':
+            return False
+        
+    return True
+
+
+class RateLimiter:
+    """Token bucket limiting how many requests per second hit the site."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
 
 
 class SiteScraper:
-    def __init__(self, base_url=None, headless=True, language=None):
+    def __init__(self, base_url=None, headless=True, language=None, concurrency=None,
+                 workers=None, rate_limit=None):
         self.base_url = base_url or os.getenv('BASE_URL')
         if not self.base_url:
             raise ValueError("BASE_URL must be provided either as argument or environment variable")
         self.domain = urlparse(self.base_url).netloc
         self.visited_urls = set()
         self.urls_to_visit = deque([self.base_url])
+        self.queued = {self.base_url}
         self.language = language or os.getenv('SCRAPER_LANGUAGE')
+        self.concurrency = concurrency or int(os.getenv('SCRAPER_CONCURRENCY', 10))
+        self.workers = workers or int(os.getenv('SCRAPER_WORKERS', 3))
+        self.rate_limit = rate_limit or float(os.getenv('SCRAPER_RATE_LIMIT', 5))
         
         # Setup logging
         logging.basicConfig(
@@ -36,175 +178,247 @@ class SiteScraper:
         )
         self.logger = logging.getLogger(__name__)
         
+        # Output directory and index, which grows as pages are saved
+        self.output_dir = Path("output")
+        if self.language:
+            self.output_dir = self.output_dir / self.language
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        index_filename = 'site_index'
+        if self.language:
+            index_filename = f'site_index_{self.language}'
+        self._index_path = self.output_dir / f"{index_filename}.md"
+        
+        # Entries go to a temporary file that only replaces the index once a
+        # page has been saved, so a failed or empty run keeps the previous one
+        self._index_file = tempfile.NamedTemporaryFile(
+            'w', encoding='utf-8', buffering=1, dir=self.output_dir,
+            prefix=f".{index_filename}_", suffix='.tmp', delete=False
+        )
+        self._index_entries = 0
+        
+        # Markdown files are written on a background thread
+        self._writer_queue = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+        
+        # Pool of browsers used to render JS-heavy pages, one per worker thread
+        self._drivers = queue.Queue()
+        self._temp_profiles = []
+        self._render_executor = ThreadPoolExecutor(max_workers=self.workers)
+        
+        # Start the browsers in parallel to overlap Chrome startup, collecting
+        # every one that started so none leak if another slot fails
+        futures = [self._render_executor.submit(self._create_driver, headless, i) for i in range(self.workers)]
+        errors = []
+        for future in futures:
+            try:
+                self._drivers.put(future.result())
+            except Exception as e:
+                self.logger.error(f"Error initializing browser: {str(e)}")
+                errors.append(e)
+        
+        if errors:
+            self.close()
+            raise errors[0]
+        
+        self.logger.info(f"Initialized {self.workers} browsers successfully")
+
+    def _create_driver(self, headless, index):
+        """Start a Chrome instance for pool slot `index`.
+        
+        Each slot has a persistent profile so HTTP cache, DNS and TLS state
+        survive across runs. Chrome locks a profile while it runs, so when a
+        concurrent run holds it a fresh temporary profile is used instead.
+        """
+        key = FILENAME_RE.sub('_', f"{self.domain}_{self.language or 'all'}_{index}")
+        profile_dir = os.path.join(tempfile.gettempdir(), f"sitescraper_{key}")
         try:
-            # Configure Chrome options
-            chrome_options = Options()
-            if headless:
-                chrome_options.add_argument("--headless=new")
-            
-            # WebGL and graphics related options
-            chrome_options.add_argument("--use-gl=swiftshader")
-            chrome_options.add_argument("--enable-unsafe-webgl")
-            chrome_options.add_argument("--ignore-gpu-blocklist")
-            
-            # Additional stability options
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--disable-notifications")
-            chrome_options.add_argument('--disable-software-rasterizer')
-            chrome_options.add_argument('--disable-infobars')
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            # Set user agent
-            chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            self.logger.info("Browser initialized successfully")
-            
+            return self._start_chrome(headless, profile_dir)
         except Exception as e:
-            self.logger.error(f"Error initializing browser: {str(e)}")
-            raise
+            self.logger.warning(f"Profile {profile_dir} unavailable, using a temporary one: {str(e)}")
+            profile_dir = tempfile.mkdtemp(prefix="sitescraper_")
+            self._temp_profiles.append(profile_dir)
+            return self._start_chrome(headless, profile_dir)
+
+    def _start_chrome(self, headless, profile_dir):
+        """Start a configured Chrome instance using `profile_dir`."""
+        # Configure Chrome options
+        chrome_options = Options()
+        if headless:
+            chrome_options.add_argument("--headless=new")
+        
+        # Profile and disk cache
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+        chrome_options.add_argument(f"--disk-cache-dir={os.path.join(profile_dir, 'cache')}")
+        chrome_options.add_argument("--disk-cache-size=104857600")
+        
+        # WebGL and graphics related options
+        chrome_options.add_argument("--use-gl=swiftshader")
+        chrome_options.add_argument("--enable-unsafe-webgl")
+        chrome_options.add_argument("--ignore-gpu-blocklist")
+        
+        # Additional stability options
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--disable-notifications")
+        chrome_options.add_argument('--disable-software-rasterizer')
+        chrome_options.add_argument('--disable-infobars')
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        
+        # Skip images and notifications; stylesheets stay on so visibility is accurate
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2
+        })
+        
+        # Return from driver.get() at DOMContentLoaded instead of the full load event
+        chrome_options.page_load_strategy = 'eager'
+        
+        # Set user agent
+        chrome_options.add_argument(f'user-agent={USER_AGENT}')
+        
+        driver = webdriver.Chrome(options=chrome_options)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        
+        # Block media, fonts and trackers at the network level
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        return driver
 
     def _is_valid_url(self, url):
         """Check if URL should be crawled."""
         if not url or not isinstance(url, str):
             return False
-            
-        parsed = urlparse(url)
-        
-        # Must be same domain
-        if parsed.netloc != self.domain:
-            return False
-            
-        # Ignore anchors
-        if '#' in url:
-            return False
-            
-        # Ignore file downloads
-        if any(url.lower().endswith(ext) for ext in ['.pdf', '.jpg', '.png', '.gif', '.jpeg', '.doc', '.docx']):
-            return False
-            
-        # Ignore social media and external links
-        if any(pattern in url.lower() for pattern in ['facebook.com', 'twitter.com', 'linkedin.com', 'instagram.com']):
-            return False
-            
-        # Check language if specified
-        if self.language:
-            url_path = parsed.path.lower()
-            if not url_path.startswith(f'/{self.language.lower()}/') and not url_path == f'/{self.language.lower()}':
-                return False
-            
-        return True
+        return _valid_url(url, self.domain, self.language)
 
-    def _extract_links(self):
-        """Extract all valid links from current page."""
+    def _extract_links(self, tree, page_url):
+        """Extract all valid links from a parsed page."""
         links = set()
         try:
-            # Find all links
-            elements = self.driver.find_elements(By.TAG_NAME, "a")
-            for element in elements:
-                try:
-                    href = element.get_attribute("href")
-                    if href and self._is_valid_url(href):
-                        links.add(href)
-                except:
-                    continue
+            # Resolve hrefs against the page URL, as the browser would
+            for href in tree.xpath("//a/@href"):
+                href = urljoin(page_url, href)
+                if self._is_valid_url(href):
+                    links.add(href)
         except Exception as e:
             self.logger.error(f"Error extracting links: {str(e)}")
         
         return links
 
-    def _create_markdown_content(self, url):
-        """Convert page content to markdown format."""
-        content = []
+    def _parse_page(self, html, encoding=None):
+        """Parse page HTML bytes once, dropping scripts and hidden elements.
+        
+        Bytes let lxml honour XML declarations and meta charsets; `encoding`
+        is the charset from the HTTP headers, if any.
+        """
+        tree = lxml_html.document_fromstring(html, parser=_html_parser(encoding))
+        etree.strip_elements(tree, "script", "style", "noscript", "template", with_tail=False)
+        for element in HIDDEN_CANDIDATES(tree):
+            # The root element cannot be dropped
+            if element.getparent() is not None and self._is_hidden(element):
+                element.drop_tree()
+        return tree
+
+    @staticmethod
+    def _text_length(tree):
+        """Count the visible non-whitespace characters of a parsed page."""
+        return len(''.join(tree.text_content().split()))
+
+    @staticmethod
+    def _is_hidden(element):
+        """Check visibility marked by the browser, or approximate it from markup."""
+        if HIDDEN_ATTRIBUTE in element.attrib or 'hidden' in element.attrib:
+            return True
+        style = element.get('style', '').replace(' ', '').lower()
+        return 'display:none' in style or 'visibility:hidden' in style
+
+    def _create_markdown_content(self, url, tree):
+        """Convert page content to markdown format.
+        
+        Returns (content, body_lines, body_chars): the markdown and the number
+        of lines and characters written after the title and URL lines.
+        """
+        out = io.StringIO()
+        body_lines = 0
+        body_chars = 0
+        
+        def write(line, body=True):
+            nonlocal body_lines, body_chars
+            out.write(f"{line}\n\n")
+            if body:
+                body_lines += 1
+                body_chars += len(line)
         
         try:
-            # Get page title
-            title = self.driver.title
+            # Get page title, ignoring <title> elements inside the body such as SVG labels
+            title = self._clean_text(tree.findtext('head/title'))
             if title:
-                content.append(f"# {self._clean_text(title)}\n")
+                write(f"# {title}", body=False)
             
             # Add URL reference
-            content.append(f"*Original URL: {url}*\n")
+            write(f"*Original URL: {url}*", body=False)
             
-            # Wait for content to load
-            self._wait_for_content()
-            
-            # Try to find main content areas
-            content_selectors = [
-                "main", "article", "#content", ".content", ".main-content",
-                ".page-content", ".entry-content", ".post-content",
-                "section", ".section", "[role='main']", ".container",
-                "#main", ".main", ".body-content"
-            ]
-            
-            main_elements = []
-            for selector in content_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    main_elements.extend(elements)
-                except:
-                    continue
+            # Use the first selector that finds a substantial container, otherwise
+            # every content area via one combined selector, in document order
+            for selector in CONTENT_SELECTORS:
+                main_elements = _compiled_selector((selector,))(tree)
+                if any(len(element.text_content()) > MAIN_CONTENT_CHARS for element in main_elements):
+                    break
+            else:
+                main_elements = _compiled_selector(CONTENT_SELECTORS)(tree)
             
             # If no main content areas found, use body
             if not main_elements:
-                main_elements = [self.driver.find_element(By.TAG_NAME, "body")]
+                body = tree.find('body')
+                main_elements = [body if body is not None else tree]
+            
+            # Processed containers and emitted elements; holding the element
+            # proxies keeps their identity stable for the membership checks
+            processed = set()
+            emitted = set()
             
             for main_content in main_elements:
+                # Skip containers nested in an already processed one
+                if any(parent in processed for parent in main_content.iterancestors()):
+                    continue
+                processed.add(main_content)
+                
                 try:
                     # Process all text containing elements
-                    elements = main_content.find_elements(
-                        By.CSS_SELECTOR,
-                        "h1, h2, h3, h4, h5, h6, p, li, span, div"
-                    )
-                    
-                    for element in elements:
-                        try:
-                            # Skip hidden elements and empty text
-                            if not element.is_displayed():
-                                continue
-                                
-                            # Skip if element is a child of already processed element
-                            parent = element.find_element(By.XPATH, "..")
-                            if parent in elements:
-                                continue
-                            
-                            # Get element text
-                            text = self._clean_text(element.text)
-                            if not text:
-                                continue
-                            
-                            # Handle headings
-                            tag_name = element.tag_name
-                            if tag_name.startswith('h') and len(tag_name) == 2:
-                                level = int(tag_name[1])
-                                content.append(f"{'#' * level} {text}\n")
-                            
-                            # Handle lists
-                            elif tag_name == 'li':
-                                content.append(f"- {text}\n")
-                            
-                            # Handle other text elements
-                            else:
-                                content.append(f"{text}\n")
-                                
-                        except:
+                    for element in main_content.iterdescendants(*TEXT_TAGS):
+                        # Skip if element is inside an already emitted element
+                        if any(parent in emitted for parent in element.iterancestors()):
+                            continue
+                        
+                        # Get element text
+                        text = self._clean_text(" ".join(element.itertext()))
+                        if not text:
                             continue
+                        emitted.add(element)
+                        
+                        # Handle headings
+                        tag_name = element.tag
+                        if tag_name.startswith('h') and len(tag_name) == 2:
+                            level = int(tag_name[1])
+                            write(f"{'#' * level} {text}")
+                        
+                        # Handle lists
+                        elif tag_name == 'li':
+                            write(f"- {text}")
+                        
+                        # Handle other text elements
+                        else:
+                            write(text)
                     
                     # Process buttons and links text
-                    for element in main_content.find_elements(By.CSS_SELECTOR, "button, a"):
-                        try:
-                            if element.is_displayed():
-                                text = self._clean_text(element.text)
-                                if text and len(text) > 5:  # Skip very short button/link text
-                                    content.append(f"_{text}_\n")
-                        except:
-                            continue
+                    for element in main_content.iterdescendants("button", "a"):
+                        text = self._clean_text(" ".join(element.itertext()))
+                        if text and len(text) > 5:  # Skip very short button/link text
+                            write(f"_{text}_")
                             
                 except Exception as e:
                     self.logger.warning(f"Error processing main content section: {str(e)}")
@@ -213,125 +427,307 @@ class SiteScraper:
         except Exception as e:
             self.logger.error(f"Error creating markdown content: {str(e)}")
         
-        return '\n'.join(content)
+        return out.getvalue(), body_lines, body_chars
 
-    def _wait_for_content(self):
-        """Wait for page content to load."""
+    def _wait_for_content(self, driver):
+        """Wait until the page shows content and its text stops changing."""
+        last_length = None
+        
+        def text_settled(d):
+            nonlocal last_length
+            length = d.execute_script(TEXT_LENGTH_JS)
+            settled = length == last_length
+            last_length = length
+            return settled
+        
+        # Pages built only from divs and spans never match the content probe,
+        # so a timeout here must not skip the settle check below
         try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            time.sleep(2)  # Allow for dynamic content
+            WebDriverWait(driver, 2).until(lambda d: d.execute_script(CONTENT_READY_JS))
         except Exception as e:
-            self.logger.warning(f"Timeout waiting for content: {str(e)}")
+            self.logger.warning(f"Timeout waiting for content elements: {str(e)}")
+        
+        try:
+            # Client-side rendering is done once two samples 200ms apart agree
+            WebDriverWait(driver, 5, poll_frequency=0.2).until(text_settled)
+        except Exception as e:
+            self.logger.warning(f"Timeout waiting for content to settle: {str(e)}")
 
     def _clean_text(self, text):
         """Clean and format text for markdown."""
         if not text:
             return ""
         text = text.strip()
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'([*_`#\[\]])', r'\\\1', text)
+        text = WHITESPACE_RE.sub(' ', text)
+        text = MARKDOWN_ESCAPE_RE.sub(r'\\\1', text)
         return text
 
-    def _save_markdown(self, content, filename):
-        """Save content to a markdown file if it has meaningful content."""
+    def _save_markdown(self, content, body_lines, body_chars, filename, url):
+        """Queue content for saving to a markdown file if it has meaningful content."""
         # Check if the content has more than just title and URL
-        content_lines = content.strip().split('\n')
-        if len(content_lines) <= 2:  # Only title and URL line
+        if body_lines == 0:
             self.logger.warning(f"Skipping empty page: {filename}")
             return False
             
         # Check if there's actual content (more than 100 characters after title and URL)
-        actual_content = '\n'.join(content_lines[2:])
-        if len(actual_content.strip()) < 100:
+        if body_chars < 100:
             self.logger.warning(f"Skipping page with insufficient content: {filename}")
             return False
         
-        output_dir = Path("output")
-        if self.language:
-            output_dir = output_dir / self.language
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
         # Clean filename
-        filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-        file_path = output_dir / f"{filename}.md"
+        filename = FILENAME_RE.sub('_', filename)
+        file_path = self.output_dir / f"{filename}.md"
         
+        self._writer_queue.put((file_path, content, body_lines, url))
+        return True
+
+    def _writer_loop(self):
+        """Write queued markdown files until a None sentinel arrives."""
+        while True:
+            item = self._writer_queue.get()
+            if item is None:
+                break
+            
+            file_path, content, body_lines, url = item
+            try:
+                file_path.write_text(content, encoding='utf-8')
+                self._index_file.write(f"- [{url}]({file_path.as_posix()})\n")
+                self._index_entries += 1
+                self.logger.info(f"Successfully saved {file_path} with {body_lines} content lines")
+            except Exception as e:
+                self.logger.error(f"Error saving file {file_path}: {e}")
+
+    def _finish_index(self):
+        """Sort the index entries by URL and move the index into place."""
+        self._index_file.close()
+        temp_path = Path(self._index_file.name)
+        if not self._index_entries:
+            temp_path.unlink()
+            self.logger.warning("No pages saved, keeping the previous index")
+            return
+        
+        entries = sorted(temp_path.read_text(encoding='utf-8').splitlines())
+        temp_path.write_text('\n'.join(["# Site Content Index", ""] + entries) + '\n', encoding='utf-8')
+        os.replace(temp_path, self._index_path)
+
+    async def _fetch(self, session, url):
+        """Fetch static HTML for a URL, returning (final_url, status, html, charset).
+        
+        `html` holds the raw body bytes and is None unless the response is a
+        200 HTML page; `status` is None when the request itself failed.
+        """
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            self.logger.info(f"Successfully saved {file_path} with {len(content_lines)} lines")
-            return True
+            await self._rate_limiter.acquire()
+            async with session.get(url) as response:
+                if response.status != 200 or 'html' not in response.headers.get('Content-Type', ''):
+                    return str(response.url), response.status, None, None
+                return str(response.url), response.status, await response.read(), response.charset
         except Exception as e:
-            self.logger.error(f"Error saving file {file_path}: {e}")
-            return False
+            self.logger.warning(f"Error fetching {url}: {str(e)}")
+            return url, None, None, None
+
+    async def _fetch_bytes(self, session, url):
+        """Fetch a raw resource such as robots.txt or a sitemap, or None."""
+        try:
+            await self._rate_limiter.acquire()
+            async with session.get(url) as response:
+                if response.status != 200:
+                    return None
+                return await response.read()
+        except Exception as e:
+            self.logger.warning(f"Error fetching {url}: {str(e)}")
+            return None
+
+    @staticmethod
+    def _sitemap_entries(body):
+        """Stream (kind, url) pairs from a sitemap, kind being 'url' or 'sitemap'."""
+        if body.startswith(b'\x1f\x8b'):
+            body = gzip.decompress(body)
+        # Only the direct <loc> of each entry counts, not e.g. nested <image:loc>
+        for _, element in etree.iterparse(io.BytesIO(body), events=('end',), tag=('{*}url', '{*}sitemap'),
+                                          resolve_entities=False):
+            loc = element.findtext('{*}loc')
+            if loc and loc.strip():
+                yield etree.QName(element).localname, loc.strip()
+            
+            # Drop finished entries so large sitemaps parse in constant memory
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
 
-    def _create_index(self):
-        """Create an index file of all scraped pages."""
-        index_content = ["# Site Content Index\n"]
+    async def _seed_from_sitemaps(self, session):
+        """Queue the URLs listed in the site's sitemaps and return how many were added."""
+        parsed = urlparse(self.base_url)
+        root = f"{parsed.scheme}://{parsed.netloc}"
         
-        for url in sorted(self.visited_urls):
-            filename = urlparse(url).path.strip('/').replace('/', '_') or 'index'
-            output_path = "output"
-            if self.language:
-                output_path = f"output/{self.language}"
-            index_content.append(f"- [{url}]({output_path}/{filename}.md)")
+        # Sitemaps announced in robots.txt, falling back to the conventional location
+        sitemaps = []
+        robots_txt = await self._fetch_bytes(session, f"{root}/robots.txt")
+        if robots_txt:
+            robots = RobotFileParser()
+            robots.parse(robots_txt.decode('utf-8', errors='replace').splitlines())
+            sitemaps = robots.site_maps() or []
+        if not sitemaps:
+            sitemaps = [f"{root}/sitemap.xml"]
         
-        index_filename = 'site_index'
-        if self.language:
-            index_filename = f'site_index_{self.language}'
-        self._save_markdown('\n'.join(index_content), index_filename)
+        added = 0
+        seen = set()
+        while sitemaps:
+            sitemap_url = sitemaps.pop()
+            if sitemap_url in seen:
+                continue
+            seen.add(sitemap_url)
+            
+            body = await self._fetch_bytes(session, sitemap_url)
+            if not body:
+                continue
+            
+            try:
+                for kind, url in self._sitemap_entries(body):
+                    # Sitemap indexes point to further sitemaps
+                    if kind == 'sitemap':
+                        sitemaps.append(url)
+                    elif kind == 'url' and self._is_valid_url(url) and url not in self.visited_urls and url not in self.queued:
+                        self.urls_to_visit.append(url)
+                        self.queued.add(url)
+                        added += 1
+            except Exception as e:
+                self.logger.warning(f"Error parsing sitemap {sitemap_url}: {str(e)}")
+        
+        return added
 
-    def scrape_site(self, max_pages=None):
-        """Scrape the entire website."""
+    def _render(self, url):
+        """Render a page in a pooled browser, returning (final_url, html)."""
+        driver = self._drivers.get()
+        try:
+            driver.get(url)
+            self._wait_for_content(driver)
+            snapshot = driver.execute_cdp_cmd("Runtime.evaluate", {
+                "expression": RENDER_SNAPSHOT_JS,
+                "returnByValue": True
+            })
+            page = snapshot["result"]["value"]
+            return page["url"], page["html"]
+        finally:
+            self._drivers.put(driver)
+
+    async def _scrape_page(self, session, url):
+        """Scrape a single page and return its links, or None on failure."""
+        try:
+            page_url, status, html, charset = await self._fetch(session, url)
+            
+            # Missing pages and non-HTML resources are not pages to scrape
+            if status in MISSING_STATUSES:
+                self.logger.warning(f"Skipping {url}: HTTP {status}")
+                return set()
+            if status == 200 and html is None:
+                self.logger.warning(f"Skipping non-HTML resource: {url}")
+                return set()
+            
+            # Static HTML that fails to parse is treated like empty HTML
+            tree = None
+            if html and html.strip():
+                try:
+                    tree = self._parse_page(html, charset)
+                except Exception as e:
+                    self.logger.warning(f"Error parsing {url}: {str(e)}")
+            text_length = self._text_length(tree) if tree is not None else 0
+            
+            # Fall back to the browser for empty or JS-rendered pages, or when
+            # the static fetch failed or was refused
+            if text_length < JS_RENDER_THRESHOLD:
+                await self._rate_limiter.acquire()
+                loop = asyncio.get_running_loop()
+                page_url, html = await loop.run_in_executor(self._render_executor, self._render, url)
+                tree = self._parse_page(html.encode('utf-8'), 'utf-8')
+                text_length = self._text_length(tree)
+            
+            # Only generate markdown for pages with enough text to be kept
+            if text_length < MIN_PAGE_CHARS:
+                self.logger.warning(f"Skipping page with insufficient content: {url}")
+            else:
+                content, body_lines, body_chars = self._create_markdown_content(url, tree)
+                filename = urlparse(url).path.strip('/').replace('/', '_') or 'index'
+                self._save_markdown(content, body_lines, body_chars, filename, url)
+            
+            return self._extract_links(tree, page_url)
+        
+        except Exception as e:
+            self.logger.error(f"Error processing {url}: {str(e)}")
+            return None
+
+    async def _scrape_async(self, max_pages):
+        """Crawl the site keeping up to `concurrency` pages in flight."""
         page_count = 0
+        pending = {}
+        # No burst, so requests are spaced evenly at SCRAPER_RATE_LIMIT per second
+        self._rate_limiter = RateLimiter(self.rate_limit)
         
-        while self.urls_to_visit and (max_pages is None or page_count < max_pages):
-            current_url = self.urls_to_visit.popleft()
+        headers = {'User-Agent': USER_AGENT}
+        timeout = aiohttp.ClientTimeout(total=30)
+        # Keep-alive connections and cached DNS are reused across the whole crawl
+        connector = aiohttp.TCPConnector(limit_per_host=self.concurrency, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(headers=headers, timeout=timeout, connector=connector) as session:
+            # Sitemap URLs are queued first, so they are visited before links
+            # discovered while crawling, which still cover partial sitemaps
+            seeded = await self._seed_from_sitemaps(session)
+            if seeded:
+                self.logger.info(f"Queued {seeded} URLs from sitemaps")
             
-            if current_url in self.visited_urls:
-                continue
-                
-            try:
-                self.logger.info(f"Scraping page {page_count + 1}: {current_url}")
-                
-                # Navigate to the page
-                self.driver.get(current_url)
-                
-                # Extract and save content
-                content = self._create_markdown_content(current_url)
-                filename = urlparse(current_url).path.strip('/').replace('/', '_') or 'index'
-                self._save_markdown(content, filename)
-                
-                # Mark as visited
-                self.visited_urls.add(current_url)
-                page_count += 1
-                
-                # Extract new links
-                new_links = self._extract_links()
-                for link in new_links:
-                    if link not in self.visited_urls:
-                        self.urls_to_visit.append(link)
+            while self.urls_to_visit or pending:
+                # Top up the in-flight pages from the queue
+                while (self.urls_to_visit and len(pending) < self.concurrency
+                       and (max_pages is None or page_count + len(pending) < max_pages)):
+                    current_url = self.urls_to_visit.popleft()
+                    self.queued.discard(current_url)
+                    
+                    # Claim the URL before awaiting so no other task picks it up
+                    self.visited_urls.add(current_url)
+                    self.logger.info(f"Scraping page {page_count + len(pending) + 1}: {current_url}")
+                    task = asyncio.ensure_future(self._scrape_page(session, current_url))
+                    pending[task] = current_url
                 
-                # Random delay between requests
-                time.sleep(1)
+                if not pending:
+                    break
                 
-            except Exception as e:
-                self.logger.error(f"Error processing {current_url}: {str(e)}")
-                continue
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    current_url = pending.pop(task)
+                    new_links = task.result()
+                    if new_links is None:
+                        self.visited_urls.discard(current_url)
+                        continue
+                    
+                    page_count += 1
+                    for link in new_links:
+                        if link not in self.visited_urls and link not in self.queued:
+                            self.urls_to_visit.append(link)
+                            self.queued.add(link)
         
-        # Create index file
-        self._create_index()
+        return page_count
+
+    def scrape_site(self, max_pages=None):
+        """Scrape the entire website."""
+        page_count = asyncio.run(self._scrape_async(max_pages))
         self.logger.info(f"Completed scraping {page_count} pages")
 
     def close(self):
-        """Close the browser."""
-        try:
-            if self.driver:
-                self.driver.quit()
-                self.logger.info("Browser closed successfully")
-        except Exception as e:
-            self.logger.error(f"Error closing browser: {str(e)}")
+        """Close the browsers and finish pending file and index writes."""
+        self._render_executor.shutdown(wait=True)
+        self._writer_queue.put(None)
+        self._writer.join()
+        self._finish_index()
+        while not self._drivers.empty():
+            driver = self._drivers.get()
+            try:
+                driver.quit()
+            except Exception as e:
+                self.logger.error(f"Error closing browser: {str(e)}")
+        for profile_dir in self._temp_profiles:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        self.logger.info("Browsers closed successfully")
+
+
 def main():
     max_pages = 100  # Limit the number of pages to scrape, set to None for no limit
     